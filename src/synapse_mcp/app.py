@@ -70,10 +70,7 @@ async def health_check(request: Request) -> JSONResponse:
             "service": "synapse-mcp",
             "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
             "version": "0.2.0",
-            "is_oauth_configured": bool(
-                os.environ.get("SYNAPSE_OAUTH_CLIENT_ID")
-                and os.environ.get("SYNAPSE_OAUTH_CLIENT_SECRET")
-            ),
+            "is_oauth_configured": has_oauth,
         }
     )
 
@@ -24,7 +24,8 @@ Per OAuth 2.1 / MCP spec:
 
 ## Architecture
 
-Each request is independently authenticated. No caching or session lookups bc client sends token with every request.
+Each request is independently authenticated; no session lookups bc client sends token with every request.
+Decoded expirations are cached per token digest so repeat requests only re-check `exp`.
 - Proper multi-user isolation
 - Spec compliance
 - Simple, auditable auth flow
@@ -35,22 +36,44 @@ from __future__ import annotations
 from datetime import datetime, timezone
 import logging
 import os
+import time
 from typing import Any, Optional
 
 from fastmcp.server.middleware import Middleware, MiddlewareContext
 try:
-    from fastmcp.server.dependencies import get_access_token, get_http_request
+    from fastmcp.server.dependencies import get_http_request
 except ImportError:
-    get_access_token = None
     get_http_request = None
 
-from starlette.responses import JSONResponse
 from starlette.exceptions import HTTPException
 
-from .utils import mask_identifier, mask_token
+from .connection_auth import OAUTH_TOKEN_KEY, PAT_TOKEN_KEY
+from .utils import ExpiringLRUCache, decode_jwt_payload, mask_token, token_digest
 
 logger = logging.getLogger("synapse_mcp.auth_middleware")
 
+# Auth schemes are case-insensitive (RFC 7235), so prefixes are compared lowercased
+_BEARER = "bearer "
+_BEARER_LEN = len(_BEARER)
+
+# Validated token digests -> ``exp`` claim. Clients resend the same bearer token
+# on every call, so only the first request per token pays for decoding. Keyed by
+# digest so the cache never holds raw credentials.
+_JWT_CACHE_MAXSIZE = 4096
+_jwt_exp_cache = ExpiringLRUCache(maxsize=_JWT_CACHE_MAXSIZE)
+
+
+class _MaskedToken:
+    """Log argument that masks a token only if the record is actually emitted."""
+
+    __slots__ = ("token",)
+
+    def __init__(self, token: Optional[str]) -> None:
+        self.token = token
+
+    def __str__(self) -> str:
+        return str(mask_token(self.token))
+
 
 class AuthenticationError(HTTPException):
     """HTTP 401 Unauthorized - Missing or invalid token."""
@@ -69,12 +92,14 @@ def validate_jwt_token(token: str) -> None:
     Raises:
         AuthenticationError: If token is invalid or expired (HTTP 401)
     """
-    try:
-        import jwt
+    cache_key = token_digest(token)
+    if _jwt_exp_cache.get(cache_key) is not None:
+        return
 
+    try:
         # Decode without signature verification (we trust Synapse's token)
         # But validate structure and expiration
-        decoded = jwt.decode(token, options={"verify_signature": False})
+        decoded = decode_jwt_payload(token)
 
         # Check expiration (required by OAuth 2.1)
         exp = decoded.get("exp")
@@ -83,15 +108,17 @@ def validate_jwt_token(token: str) -> None:
             raise AuthenticationError("Invalid token: missing expiration")
 
         # Check if token is expired
-        now = datetime.now(timezone.utc).timestamp()
+        now = time.time()
         if now >= exp:
             logger.info("Token expired: exp=%s, now=%s", exp, now)
             raise AuthenticationError("Token expired")
 
-        # Token is valid
-        logger.debug("Token validated: expires_at=%s", datetime.fromtimestamp(exp, timezone.utc).isoformat())
+        # Token is valid; remember it until it expires
+        _jwt_exp_cache.set(cache_key, exp, expires_at=exp)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Token validated: expires_at=%s", datetime.fromtimestamp(exp, timezone.utc).isoformat())
 
-    except jwt.DecodeError as e:
+    except ValueError as e:
         logger.warning("Invalid JWT token structure: %s", e)
         raise AuthenticationError("Invalid token format")
     except AuthenticationError:
@@ -116,6 +143,10 @@ class OAuthTokenMiddleware(Middleware):
     Each request is independently authenticated, maintaining proper multi-user isolation.
     """
 
+    def __init__(self):
+        # Bound once so the per-request path avoids repeated global lookups
+        self._get_http_request = get_http_request
+
     async def on_call_tool(self, context: MiddlewareContext, call_next):
         """
         Intercepts a tool call to store OAuth token information in the context.
@@ -162,9 +193,9 @@ class OAuthTokenMiddleware(Middleware):
             AuthenticationError (HTTP 401): If token is missing, invalid, or expired
         """
         # Inspect HTTP request to see what auth info is sent (debug mode)
-        if get_http_request and logger.isEnabledFor(logging.DEBUG):
+        if logger.isEnabledFor(logging.DEBUG) and self._get_http_request is not None:
             try:
-                http_request = get_http_request()
+                http_request = self._get_http_request()
                 if http_request:
                     logger.debug(
                         "HTTP Request - URL: %s, Method: %s, Has Auth: %s",
@@ -175,12 +206,16 @@ class OAuthTokenMiddleware(Middleware):
             except Exception as exc:
                 logger.debug("Could not inspect HTTP request: %s", exc)
 
-        fast_ctx = getattr(context, "fastmcp_context", None)
-        logger.debug(
-            "_store_auth_info invoked: context=%s fastmcp_context=%s",
-            type(context).__name__,
-            type(fast_ctx).__name__ if fast_ctx else None,
-        )
+        try:
+            fast_ctx = context.fastmcp_context
+        except AttributeError:
+            fast_ctx = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "_store_auth_info invoked: context=%s fastmcp_context=%s",
+                type(context).__name__,
+                type(fast_ctx).__name__ if fast_ctx else None,
+            )
         if fast_ctx is None:
             logger.debug("Skipping OAuth middleware: missing fastmcp_context")
             return
@@ -188,12 +223,22 @@ class OAuthTokenMiddleware(Middleware):
         # Resolve and validate token - raises AuthenticationError on failure
         token = await self._resolve_token(context, fast_ctx)
 
+        # Chained calls in one context carry the same token; skip the rewrite.
+        # Validation above still runs so an expired token is always rejected.
+        try:
+            if fast_ctx.get_state(OAUTH_TOKEN_KEY) == token:
+                return
+        except (AttributeError, KeyError):
+            pass
+
         # Store validated token in context for connection_auth to use
-        if hasattr(fast_ctx, "set_state"):
-            fast_ctx.set_state("oauth_access_token", token)
-            logger.debug("Stored validated OAuth token in context")
-        else:
+        try:
+            set_state = fast_ctx.set_state
+        except AttributeError:
             logger.warning("FastMCP context does not expose set_state; unable to store token")
+            return
+        set_state(OAUTH_TOKEN_KEY, token)
+        logger.debug("Stored validated OAuth token in context")
 
     async def _resolve_token(self, context: MiddlewareContext, fast_ctx: Any) -> str:
         """
@@ -216,33 +261,42 @@ class OAuthTokenMiddleware(Middleware):
         token = None
 
         # Primary path: Extract from Authorization header
-        if get_http_request:
+        if self._get_http_request is not None:
             try:
-                http_request = get_http_request()
-                if http_request and hasattr(http_request, 'headers'):
-                    auth_header = http_request.headers.get("authorization")
-                    if auth_header and auth_header.startswith("Bearer "):
-                        token = auth_header[len("Bearer "):]
-                        logger.info("Extracted token from Authorization header: %s", mask_token(token))
+                auth_header = self._get_http_request().headers.get("authorization")
             except Exception as exc:
+                auth_header = None
                 logger.debug("Could not extract token from HTTP request: %s", exc)
 
+            if auth_header and auth_header[:_BEARER_LEN].lower() == _BEARER:
+                token = auth_header[_BEARER_LEN:]
+                logger.info("Extracted token from Authorization header: %s", _MaskedToken(token))
+
         # Fallback: Check auth_context (in case FastMCP populates it differently)
         if not token:
-            auth_ctx = getattr(context, "auth_context", None)
+            try:
+                auth_ctx = context.auth_context
+            except AttributeError:
+                auth_ctx = None
             if not auth_ctx:
-                auth_ctx = getattr(fast_ctx, "auth_context", None)
+                try:
+                    auth_ctx = fast_ctx.auth_context
+                except AttributeError:
+                    auth_ctx = None
 
             if auth_ctx:
-                token = getattr(auth_ctx, "token", None)
+                try:
+                    token = auth_ctx.token
+                except AttributeError:
+                    token = None
                 if token:
-                    logger.info("Using token from auth_context: %s", mask_token(token))
+                    logger.info("Using token from auth_context: %s", _MaskedToken(token))
 
         # Last resort: Check for bearer token in context message headers
         if not token:
             token = self._extract_token_from_headers(context)
             if token:
-                logger.info("Extracted token from context headers: %s", mask_token(token))
+                logger.info("Extracted token from context headers: %s", _MaskedToken(token))
 
         if not token:
             logger.warning("No Authorization header in request - HTTP 401")
@@ -256,11 +310,12 @@ class OAuthTokenMiddleware(Middleware):
 
     def _extract_token_from_headers(self, context: MiddlewareContext) -> Optional[str]:
         """Extract token from context message headers."""
-        message = getattr(context, "message", None)
-        headers = getattr(message, "headers", {}) if message else {}
-        auth_header = headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header[len("Bearer "):]
+        try:
+            auth_header = context.message.headers.get("Authorization")
+        except AttributeError:
+            return None
+        if auth_header and auth_header[:_BEARER_LEN].lower() == _BEARER:
+            token = auth_header[_BEARER_LEN:]
             logger.debug("Using Authorization header bearer token")
             return token
         return None
@@ -292,7 +347,7 @@ class PATAuthMiddleware(Middleware):
                 "Set SYNAPSE_PAT for development mode."
             )
         logger.info("PAT authentication enabled (development mode)")
-        logger.debug("PAT token loaded from environment: %s", mask_token(self.synapse_pat))
+        logger.debug("PAT token loaded from environment: %s", _MaskedToken(self.synapse_pat))
 
     async def on_call_tool(self, context: MiddlewareContext, call_next):
         """
@@ -329,23 +384,36 @@ class PATAuthMiddleware(Middleware):
         Stores the PAT in the fastmcp_context state so connection_auth
         can retrieve it without needing to read from environment variables.
         """
-        fast_ctx = getattr(context, "fastmcp_context", None)
-
-        logger.debug(
-            "_inject_pat invoked: context=%s fastmcp_context=%s",
-            type(context).__name__,
-            type(fast_ctx).__name__ if fast_ctx else None,
-        )
+        try:
+            fast_ctx = context.fastmcp_context
+        except AttributeError:
+            fast_ctx = None
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "_inject_pat invoked: context=%s fastmcp_context=%s",
+                type(context).__name__,
+                type(fast_ctx).__name__ if fast_ctx else None,
+            )
 
         if fast_ctx is None:
             logger.warning("Missing fastmcp_context; unable to inject PAT")
             return
 
-        if hasattr(fast_ctx, "set_state"):
-            fast_ctx.set_state("synapse_pat_token", self.synapse_pat)
-            logger.debug("Injected PAT token into context")
-        else:
+        # The PAT is constant, so contexts that already carry it need no write
+        try:
+            if fast_ctx.get_state(PAT_TOKEN_KEY) is self.synapse_pat:
+                return
+        except (AttributeError, KeyError):
+            pass
+
+        try:
+            set_state = fast_ctx.set_state
+        except AttributeError:
             logger.warning("FastMCP context does not expose set_state; unable to inject PAT")
+            return
+        set_state(PAT_TOKEN_KEY, self.synapse_pat)
+        logger.debug("Injected PAT token into context")
 
 
 __all__ = ["OAuthTokenMiddleware", "PATAuthMiddleware"]
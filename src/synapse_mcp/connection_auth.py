@@ -25,56 +25,170 @@ and authenticates the synapseclient.
 """
 
 import logging
-from typing import Optional, Dict, Any
+import os
+from threading import Lock
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from fastmcp import Context
+import requests
+from requests.adapters import HTTPAdapter
 import synapseclient
 
+from .utils import ExpiringLRUCache, decode_jwt_payload, token_digest
+
 logger = logging.getLogger("synapse_mcp.connection_auth")
 
 # Constants for context state keys
 SYNAPSE_CLIENT_KEY = "synapse_client"
 USER_AUTH_INFO_KEY = "user_auth_info"
 AUTH_INITIALIZED_KEY = "auth_initialized"
+POOLED_CLIENT_KEY = "pooled_synapse_client"
+OAUTH_TOKEN_KEY = "oauth_access_token"
+PAT_TOKEN_KEY = "synapse_pat_token"
+
+FULL_ACCESS_SCOPE = "full_access"
+_PAT_SCOPES = frozenset({FULL_ACCESS_SCOPE})
+
+# Authenticated clients keyed by token digest, shared by connections presenting
+# the same token so they reuse one login and one HTTP connection pool. Entries
+# are dropped after CLIENT_POOL_IDLE_SECONDS without use or when the token expires.
+CLIENT_POOL_IDLE_SECONDS = 900
+CLIENT_POOL_MAXSIZE = 512
+_client_pool = ExpiringLRUCache(maxsize=CLIENT_POOL_MAXSIZE)
+
+
+class PooledClient:
+    """A pooled client with the state shared by every connection using it."""
+
+    __slots__ = ("client", "auth_info", "token_exp", "entity_ops")
+
+    def __init__(self, client: synapseclient.Synapse, auth_info: Optional[Dict[str, Any]], token_exp: Optional[float]):
+        self.client = client
+        self.auth_info = auth_info
+        # Decoded once at login so idle refreshes never re-parse the token
+        self.token_exp = token_exp
+        # Entity operation wrappers, built on first use by context_helpers
+        self.entity_ops: Optional[Dict[str, Any]] = None
+
+# Per-token [lock, users] held while a cold client logs in. ``users`` counts the
+# callers holding or waiting on the lock; the entry is removed when it drops to 0.
+_auth_locks: Dict[bytes, List[Any]] = {}
+_auth_locks_guard = Lock()
+
+# Keep-alive connections each client may hold to Synapse. The requests default
+# of 10 is easily exhausted by concurrent tool calls, forcing new TLS handshakes.
+SYNAPSE_POOL_SIZE = int(os.environ.get("SYNAPSE_POOL_SIZE", "50"))
+
+# OAuth identity comes from the profile login() resolves. Set
+# SYNAPSE_VERIFY_PROFILE_ON_AUTH=1 to also confirm it with a separate profile
+# lookup; authentication fails if the two disagree.
+VERIFY_PROFILE_ON_AUTH = os.environ.get("SYNAPSE_VERIFY_PROFILE_ON_AUTH") == "1"
+
+
+# (get_state, set_state) per context class, resolved once instead of on every access
+_STATE_ACCESSORS: Dict[type, Tuple[Optional[Callable], Optional[Callable]]] = {}
+
+
+def _state_accessors(ctx: Context) -> Tuple[Optional[Callable], Optional[Callable]]:
+    cls = type(ctx)
+    accessors = _STATE_ACCESSORS.get(cls)
+    if accessors is None:
+        getter = getattr(cls, "get_state", None)
+        setter = getattr(cls, "set_state", None)
+        accessors = (getter if callable(getter) else None, setter if callable(setter) else None)
+        _STATE_ACCESSORS[cls] = accessors
+    return accessors
 
 
 def _get_state(ctx: Context, key: str, default: Optional[Any] = None) -> Optional[Any]:
-    getter = getattr(ctx, "get_state", None)
-    if not callable(getter):
+    getter = _state_accessors(ctx)[0]
+    if getter is None:
         return default
     try:
-        value = getter(key)
-    except (TypeError, AttributeError):
-        # Unexpected signature; fall back if possible
-        try:
-            value = getter(key)  # type: ignore[misc]
-        except Exception:  # pragma: no cover - safeguard
-            return default
+        return getter(ctx, key)
     except KeyError:
         return default
-    if value is None and default is not None:
-        return default
-    return value
 
 
 def _set_state(ctx: Context, key: str, value: Any) -> None:
-    setter = getattr(ctx, "set_state", None)
-    if not callable(setter):
+    setter = _state_accessors(ctx)[1]
+    if setter is None:
         logger.debug("Context %s lacks set_state; unable to store %s", type(ctx).__name__, key)
         return
     try:
-        setter(key, value)
-    except TypeError:
-        try:
-            setter(key, value)  # type: ignore[misc]
-        except Exception:  # pragma: no cover - defensive
-            logger.debug("Context %s rejected set_state for %s", type(ctx).__name__, key)
-            return
+        setter(ctx, key, value)
+    except TypeError:  # pragma: no cover - defensive
+        logger.debug("Context %s rejected set_state for %s", type(ctx).__name__, key)
+
+
+def _set_state_many(ctx: Context, pairs: Dict[str, Any]) -> None:
+    """Store several state entries, resolving set_state only once."""
+    setter = _state_accessors(ctx)[1]
+    if setter is None:
+        logger.debug("Context %s lacks set_state; unable to store %s", type(ctx).__name__, list(pairs))
+        return
+    try:
+        for key, value in pairs.items():
+            setter(ctx, key, value)
+    except TypeError:  # pragma: no cover - defensive
+        logger.debug("Context %s rejected set_state for %s", type(ctx).__name__, list(pairs))
 
 
 class ConnectionAuthError(Exception):
     """Raised when connection authentication fails."""
     pass
 
+
+def _new_requests_session() -> requests.Session:
+    """Create an HTTP session with a connection pool sized for concurrent calls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=SYNAPSE_POOL_SIZE, pool_maxsize=SYNAPSE_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    """Return the ``exp`` claim of a JWT token, or None for opaque tokens."""
+    try:
+        return decode_jwt_payload(token).get("exp")
+    except ValueError:
+        return None
+
+
+def _pool_expiry(token_exp: Optional[float]) -> float:
+    """Return when a pool entry should expire: after the idle timeout or with its token."""
+    expires_at = time.time() + CLIENT_POOL_IDLE_SECONDS
+    if isinstance(token_exp, (int, float)):
+        expires_at = min(expires_at, token_exp)
+    return expires_at
+
+
+def _claim_scopes(claims: Dict[str, Any]) -> frozenset:
+    """Return the scopes granted by Synapse token claims."""
+    access = claims.get("access")
+    if isinstance(access, dict) and "scope" in access:
+        scopes = access["scope"]
+    else:
+        scopes = claims.get("scope", ())
+    if isinstance(scopes, str):
+        scopes = scopes.split()
+    return frozenset(scopes) if isinstance(scopes, (list, tuple)) else frozenset()
+
+
+def _token_scopes(token: str) -> frozenset:
+    """Return the scopes granted by an OAuth access token; opaque tokens grant none."""
+    try:
+        return _claim_scopes(decode_jwt_payload(token))
+    except ValueError:
+        return frozenset()
+
+
+def _credentials_identity(client: synapseclient.Synapse) -> Tuple[Optional[str], Optional[str]]:
+    """Return the (owner id, username) that login() resolved from the user's profile."""
+    credentials = getattr(client, "credentials", None)
+    return getattr(credentials, "owner_id", None), getattr(credentials, "username", None)
+
 def get_synapse_client(ctx: Context) -> synapseclient.Synapse:
     """
     Get or create a synapseclient instance for this connection.
@@ -92,61 +206,142 @@ def get_synapse_client(ctx: Context) -> synapseclient.Synapse:
         ConnectionAuthError: If authentication fails or is not configured
     """
     # Check if client already exists for this connection
-    logger.debug("get_synapse_client called with context type=%s attrs=%s", type(ctx).__name__, dir(ctx))
+    logger.debug("get_synapse_client called with context type=%s", type(ctx).__name__)
     client = _get_state(ctx, SYNAPSE_CLIENT_KEY)
     if client:
         logger.debug("Returning existing synapseclient for connection")
         return client
 
-    # Create new client for this connection
+    token, authenticate = _resolve_token(ctx)
+    if not token:
+        return _create_client(ctx, None, None, None)
+
+    # Reuse a client already authenticated with the same token
+    pool_key = token_digest(token)
+    client = _bind_pooled_client(ctx, pool_key)
+    if client is not None:
+        return client
+
+    # Serialize cold logins per token so concurrent connections share one login
+    lock = _acquire_auth_lock(pool_key)
+    try:
+        with lock:
+            client = _bind_pooled_client(ctx, pool_key)
+            if client is None:
+                client = _create_client(ctx, token, authenticate, pool_key)
+    finally:
+        _release_auth_lock(pool_key)
+    return client
+
+
+def _resolve_token(ctx: Context) -> Tuple[Optional[str], Optional[Callable[..., bool]]]:
+    """Return the connection's token and the function that authenticates with it."""
+    # OAuth token (production mode) takes precedence over PAT (development mode)
+    token = _get_state(ctx, OAUTH_TOKEN_KEY)
+    if token:
+        return token, _authenticate_with_oauth
+    token = _get_state(ctx, PAT_TOKEN_KEY)
+    if token:
+        return token, _authenticate_with_pat
+    return None, None
+
+
+def _acquire_auth_lock(pool_key: bytes) -> Lock:
+    """Return the login lock for ``pool_key``, registering the caller as a user."""
+    with _auth_locks_guard:
+        entry = _auth_locks.get(pool_key)
+        if entry is None:
+            entry = _auth_locks[pool_key] = [Lock(), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_auth_lock(pool_key: bytes) -> None:
+    """Drop the caller's claim on the login lock, removing it after the last user."""
+    with _auth_locks_guard:
+        entry = _auth_locks[pool_key]
+        entry[1] -= 1
+        if not entry[1]:
+            del _auth_locks[pool_key]
+
+
+def _bind_pooled_client(ctx: Context, pool_key: bytes) -> Optional[synapseclient.Synapse]:
+    """Attach the pooled client for ``pool_key`` to this connection, if one exists."""
+    pooled = _client_pool.get(pool_key)
+    if pooled is None:
+        return None
+    _client_pool.set(pool_key, pooled, expires_at=_pool_expiry(pooled.token_exp))
+    _set_state_many(ctx, {
+        USER_AUTH_INFO_KEY: pooled.auth_info,
+        SYNAPSE_CLIENT_KEY: pooled.client,
+        POOLED_CLIENT_KEY: pooled,
+        AUTH_INITIALIZED_KEY: True,
+    })
+    logger.debug("Reusing pooled synapseclient for connection")
+    return pooled.client
+
+
+def _create_client(
+    ctx: Context,
+    token: Optional[str],
+    authenticate: Optional[Callable[..., bool]],
+    pool_key: Optional[bytes],
+) -> synapseclient.Synapse:
+    """Create and authenticate a client for this connection, pooling it by token."""
     logger.info("Creating new synapseclient for connection")
-    client = synapseclient.Synapse(cache_client=False)
+    client = synapseclient.Synapse(cache_client=False, requests_session=_new_requests_session())
 
     # Authenticate the client
-    if not _authenticate_client(client, ctx):
+    if not _authenticate_client(client, ctx, token, authenticate):
         raise ConnectionAuthError("Authentication for connection needed (or re-authentication for expired sessions).")
 
     # Store client in connection context
-    _set_state(ctx, SYNAPSE_CLIENT_KEY, client)
-    _set_state(ctx, AUTH_INITIALIZED_KEY, True)
+    _set_state_many(ctx, {SYNAPSE_CLIENT_KEY: client, AUTH_INITIALIZED_KEY: True})
+    if pool_key is not None:
+        pooled = PooledClient(client, _get_state(ctx, USER_AUTH_INFO_KEY), _token_expiry(token))
+        _client_pool.set(pool_key, pooled, expires_at=_pool_expiry(pooled.token_exp))
+        _set_state(ctx, POOLED_CLIENT_KEY, pooled)
 
     logger.info("Successfully created and authenticated synapseclient for connection")
     return client
 
-def _authenticate_client(client: synapseclient.Synapse, ctx: Context) -> bool:
+def _authenticate_client(
+    client: synapseclient.Synapse,
+    ctx: Context,
+    token: Optional[str],
+    authenticate: Optional[Callable[..., bool]],
+) -> bool:
     """
-    Authenticate a synapseclient instance using token from context.
+    Authenticate a synapseclient instance using the token resolved from context.
 
     The appropriate middleware (OAuthTokenMiddleware or PATAuthMiddleware)
-    has already injected the authentication token into the context.
-    This function simply retrieves it and authenticates the client.
+    has already injected the authentication token into the context, and
+    get_synapse_client has resolved it along with the matching auth method.
 
     Args:
         client: synapseclient instance to authenticate
-        ctx: FastMCP context containing auth token
+        ctx: FastMCP context for storing auth info
+        token: Token found in context, or None
+        authenticate: _authenticate_with_oauth or _authenticate_with_pat
 
     Returns:
         bool: True if authentication succeeded, False otherwise
     """
-    try:
-        # Check for OAuth token (production mode)
-        oauth_token = _get_state(ctx, "oauth_access_token")
-        if oauth_token:
-            return _authenticate_with_oauth(client, ctx, oauth_token)
-
-        # Check for PAT token (development mode)
-        pat_token = _get_state(ctx, "synapse_pat_token")
-        if pat_token:
-            return _authenticate_with_pat(client, ctx, pat_token)
-
+    if not token or authenticate is None:
         # No token found in context - fail securely
         logger.error("No authentication token found in context - authentication required")
         return False
 
+    try:
+        return authenticate(client, ctx, token)
     except Exception as e:
-        logger.error(f"Authentication failed: {e}")
+        logger.error("Authentication failed: %s", e)
         return False
 
+def _login(client: synapseclient.Synapse, token: str) -> None:
+    """Log ``client`` in with ``token`` without synapseclient's welcome banner."""
+    client.login(authToken=token, silent=True)
+
 def _authenticate_with_oauth(client: synapseclient.Synapse, ctx: Context, token: str) -> bool:
     """
     Authenticate synapseclient using OAuth access token.
@@ -163,23 +358,33 @@ def _authenticate_with_oauth(client: synapseclient.Synapse, ctx: Context, token:
     """
     try:
         # Authenticate using the access token
-        client.login(authToken=token)
+        _login(client, token)
 
-        # Get user profile to verify authentication
-        profile = client.getUserProfile()
+        # login() already resolved the user's profile. The token's ``sub`` claim
+        # is a pairwise identifier, not the Synapse owner id, so the claims are
+        # only used for scopes.
+        user_id, username = _credentials_identity(client)
+        auth_info = {
+            "method": "oauth",
+            "user_id": user_id,
+            "username": username,
+            "scopes": _token_scopes(token),
+        }
+        if VERIFY_PROFILE_ON_AUTH:
+            # Extra round trip confirming the identity login() resolved
+            owner_id = client.getUserProfile().get("ownerId")
+            if str(owner_id) != str(user_id):
+                logger.error("OAuth profile check failed: profile owner %s does not match %s", owner_id, user_id)
+                return False
 
         # Store auth info in context
-        _set_state(ctx, USER_AUTH_INFO_KEY, {
-            "method": "oauth",
-            "user_id": profile.get("ownerId"),
-            "username": profile.get("userName"),
-        })
+        _set_state(ctx, USER_AUTH_INFO_KEY, auth_info)
 
-        logger.info(f"OAuth authentication successful for user: {profile.get('userName')}")
+        logger.info("OAuth authentication successful for user: %s", auth_info["username"] or auth_info["user_id"])
         return True
 
     except Exception as e:
-        logger.error(f"OAuth authentication failed: {e}")
+        logger.error("OAuth authentication failed: %s", e)
         return False
 
 def _authenticate_with_pat(client: synapseclient.Synapse, ctx: Context, token: str) -> bool:
@@ -198,26 +403,50 @@ def _authenticate_with_pat(client: synapseclient.Synapse, ctx: Context, token: s
     """
     try:
         # Authenticate using PAT
-        client.login(authToken=token, silent=True)
+        _login(client, token)
 
-        # Get user profile to verify authentication
-        profile = client.getUserProfile()
+        # login() already fetched the profile while verifying the token
+        user_id, username = _credentials_identity(client)
 
         # Store auth info in context
         _set_state(ctx, USER_AUTH_INFO_KEY, {
             "method": "pat",
-            "user_id": profile.get("ownerId"),
-            "username": profile.get("userName"),
-            "scopes": ["full_access"]  # PATs have full access
+            "user_id": user_id,
+            "username": username,
+            "scopes": _PAT_SCOPES,  # PATs have full access
         })
 
-        logger.info(f"PAT authentication successful for user: {profile.get('userName')}")
+        logger.info("PAT authentication successful for user: %s", username)
         return True
 
     except Exception as e:
-        logger.error(f"PAT authentication failed: {e}")
+        logger.error("PAT authentication failed: %s", e)
         return False
 
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Report usage of the shared client pool.
+
+    Returns:
+        Dict mapping each cache name to its size, capacity and hit/miss counts
+    """
+    return {
+        "client_pool": _client_pool.stats(),
+    }
+
+def get_pooled_client(ctx: Context) -> Optional[PooledClient]:
+    """
+    Get the pool entry backing this connection's client.
+
+    Args:
+        ctx: FastMCP context object
+
+    Returns:
+        PooledClient shared with other connections using the same token, or None
+        if the connection's client did not come from the pool
+    """
+    return _get_state(ctx, POOLED_CLIENT_KEY)
+
 def get_user_auth_info(ctx: Context) -> Optional[Dict[str, Any]]:
     """
     Get authentication information for the current connection.
@@ -271,5 +500,7 @@ def has_scope(ctx: Context, required_scope: str) -> bool:
     if not auth_info:
         return False
 
-    user_scopes = auth_info.get("scopes", [])
-    return required_scope in user_scopes or "full_access" in user_scopes
+    user_scopes = auth_info.get("scopes")
+    if not user_scopes:
+        return False
+    return required_scope in user_scopes or FULL_ACCESS_SCOPE in user_scopes
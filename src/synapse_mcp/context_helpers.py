@@ -5,7 +5,7 @@ from typing import Any, Dict, List, Optional
 from fastmcp import Context
 from fastmcp.server.context import request_ctx
 
-from .connection_auth import ConnectionAuthError, get_synapse_client
+from .connection_auth import ConnectionAuthError, get_pooled_client, get_synapse_client
 from .entities import (
     BaseEntityOperations,
     DatasetOperations,
@@ -15,7 +15,6 @@ from .entities import (
     TableOperations,
 )
 
-
 def get_request_context() -> Optional[Context]:
     """Return the request-scoped FastMCP context if available."""
     try:
@@ -36,21 +35,22 @@ def require_request_context() -> Context:
 
 def first_successful_result(results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Return the first non-error result from a list of entity responses."""
-    for item in results:
-        if not isinstance(item, dict):
-            return item
-        if not item.get("error"):
-            return item
-    return None
+    return next(
+        (item for item in results if not isinstance(item, dict) or not item.get("error")),
+        None,
+    )
 
 
 def get_entity_operations(ctx: Context) -> Dict[str, Any]:
     """Get entity operations for this connection's synapseclient."""
     synapse_client = get_synapse_client(ctx)
 
-    entity_ops = ctx.get_state("entity_ops")
-    if entity_ops:
-        return entity_ops
+    # Connections sharing a pooled client share one bundle, kept in the pool entry
+    pooled = get_pooled_client(ctx)
+    if pooled is not None and pooled.client is not synapse_client:
+        pooled = None
+    if pooled is not None and pooled.entity_ops is not None:
+        return pooled.entity_ops
 
     entity_ops = {
         "base": BaseEntityOperations(synapse_client),
@@ -61,7 +61,8 @@ def get_entity_operations(ctx: Context) -> Dict[str, Any]:
         "dataset": DatasetOperations(synapse_client),
     }
 
-    ctx.set_state("entity_ops", entity_ops)
+    if pooled is not None:
+        pooled.entity_ops = entity_ops
     return entity_ops
 
 
@@ -1,8 +1,12 @@
 import synapseclient
 from typing import Dict, List, Any, Optional, Union
 
+from ..utils import format_synapse_entity
+
 class BaseEntityOperations:
     """Base class for entity operations."""
+
+    __slots__ = ("synapse_client",)
     
     def __init__(self, synapse_client: synapseclient.Synapse):
         """Initialize with a Synapse client."""
@@ -52,24 +56,8 @@ class BaseEntityOperations:
         # If entity is already a dictionary, return it
         if isinstance(entity, dict):
             return entity
-            
-        # Convert entity to a dictionary
-        if hasattr(entity, 'to_dict'):
-            entity_dict = entity.to_dict()
-        else:
-            # If entity doesn't have to_dict method, convert it manually
-            entity_dict = {
-                'id': entity.id if hasattr(entity, 'id') else None,
-                'name': entity.name if hasattr(entity, 'name') else None,
-                'type': entity.concreteType.split('.')[-1] if hasattr(entity, 'concreteType') else None,
-                'parentId': entity.parentId if hasattr(entity, 'parentId') else None,
-                'createdOn': entity.createdOn if hasattr(entity, 'createdOn') else None,
-                'modifiedOn': entity.modifiedOn if hasattr(entity, 'modifiedOn') else None,
-                'createdBy': entity.createdBy if hasattr(entity, 'createdBy') else None,
-                'modifiedBy': entity.modifiedBy if hasattr(entity, 'modifiedBy') else None,
-            }
-        
-        return entity_dict
+
+        return format_synapse_entity(entity)
     
     def query_entities(self, query_params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Query entities based on parameters.
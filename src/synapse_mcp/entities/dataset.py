@@ -3,8 +3,12 @@ from typing import Dict, List, Any, Optional
 
 from .base import BaseEntityOperations
 
+DATASET_ITEM_FIELDS = ('id', 'name', 'type', 'entityId', 'versionNumber')
+
 class DatasetOperations(BaseEntityOperations):
     """Operations for Synapse Dataset entities."""
+
+    __slots__ = ()
     
     def get_dataset_items(self, dataset_id: str) -> List[Dict[str, Any]]:
         """Get items in a dataset.
@@ -29,13 +33,12 @@ class DatasetOperations(BaseEntityOperations):
             # Format each item
             formatted_items = []
             for item in items:
-                formatted_item = {
-                    'id': item.get('id') if hasattr(item, 'get') else getattr(item, 'id', None),
-                    'name': item.get('name') if hasattr(item, 'get') else getattr(item, 'name', None),
-                    'type': item.get('type') if hasattr(item, 'get') else getattr(item, 'type', None),
-                    'entityId': item.get('entityId') if hasattr(item, 'get') else getattr(item, 'entityId', None),
-                    'versionNumber': item.get('versionNumber') if hasattr(item, 'get') else getattr(item, 'versionNumber', None),
-                }
+                # Items are dict-like or plain objects; decide once per item
+                get = getattr(item, 'get', None)
+                if get is not None:
+                    formatted_item = {key: get(key) for key in DATASET_ITEM_FIELDS}
+                else:
+                    formatted_item = {key: getattr(item, key, None) for key in DATASET_ITEM_FIELDS}
                 formatted_items.append(formatted_item)
                 
             return formatted_items
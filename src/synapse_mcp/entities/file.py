@@ -5,6 +5,8 @@ from .base import BaseEntityOperations
 
 class FileOperations(BaseEntityOperations):
     """Operations for Synapse File entities."""
+
+    __slots__ = ()
     
     def get_file_content_url(self, file_id: str) -> str:
         """Get the URL for downloading a file's content.
@@ -16,7 +18,8 @@ class FileOperations(BaseEntityOperations):
             URL for downloading the file content
         """
         file_handle = self.synapse_client.get(file_id, downloadFile=False)
-        return file_handle.get('_file_handle', {}).get('url', '')
+        handle = file_handle.get('_file_handle')
+        return handle.get('url', '') if handle else ''
     
     def get_file_metadata(self, file_id: str) -> Dict[str, Any]:
         """Get metadata for a file.
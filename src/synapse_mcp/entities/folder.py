@@ -5,6 +5,8 @@ from .base import BaseEntityOperations
 
 class FolderOperations(BaseEntityOperations):
     """Operations for Synapse Folder entities."""
+
+    __slots__ = ()
     
     def get_folder_children(self, folder_id: str) -> List[Dict[str, Any]]:
         """Get children of a folder.
@@ -16,4 +18,5 @@ class FolderOperations(BaseEntityOperations):
             List of child entities
         """
         children = self.synapse_client.getChildren(folder_id)
-        return [self.format_entity(child) for child in children]
\ No newline at end of file
+        format_entity = self.format_entity
+        return [format_entity(child) for child in children]
\ No newline at end of file
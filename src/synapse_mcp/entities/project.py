@@ -5,6 +5,8 @@ from .base import BaseEntityOperations
 
 class ProjectOperations(BaseEntityOperations):
     """Operations for Synapse Project entities."""
+
+    __slots__ = ()
     
     def get_project_children(self, project_id: str) -> List[Dict[str, Any]]:
         """Get children of a project.
@@ -16,4 +18,5 @@ class ProjectOperations(BaseEntityOperations):
             List of child entities
         """
         children = self.synapse_client.getChildren(project_id)
-        return [self.format_entity(child) for child in children]
\ No newline at end of file
+        format_entity = self.format_entity
+        return [format_entity(child) for child in children]
\ No newline at end of file
@@ -3,8 +3,12 @@ from typing import Dict, List, Any, Optional, Union
 
 from .base import BaseEntityOperations
 
+COLUMN_FIELDS = ('id', 'name', 'columnType', 'maximumSize', 'defaultValue')
+
 class TableOperations(BaseEntityOperations):
     """Operations for Synapse Table entities."""
+
+    __slots__ = ()
     
     def get_table_columns(self, table_id: str) -> List[Dict[str, Any]]:
         """Get columns for a table.
@@ -66,10 +70,8 @@ class TableOperations(BaseEntityOperations):
         Returns:
             Column definition as a dictionary
         """
-        return {
-            'id': column.get('id') if hasattr(column, 'get') else getattr(column, 'id', None),
-            'name': column.get('name') if hasattr(column, 'get') else getattr(column, 'name', None),
-            'columnType': column.get('columnType') if hasattr(column, 'get') else getattr(column, 'columnType', None),
-            'maximumSize': column.get('maximumSize') if hasattr(column, 'get') else getattr(column, 'maximumSize', None),
-            'defaultValue': column.get('defaultValue') if hasattr(column, 'get') else getattr(column, 'defaultValue', None),
-        }
\ No newline at end of file
+        # Columns are dict-like or plain objects; decide once per column
+        get = getattr(column, 'get', None)
+        if get is not None:
+            return {key: get(key) for key in COLUMN_FIELDS}
+        return {key: getattr(column, key, None) for key in COLUMN_FIELDS}
\ No newline at end of file
@@ -8,7 +8,7 @@ import logging
 import os
 from pathlib import Path
 from threading import Lock
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
 try:
     import redis
@@ -20,9 +20,31 @@ except ImportError:  # pragma: no cover - redis optional
     RedisError = Exception  # type: ignore[assignment, misc]
     REDIS_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - orjson optional
+    orjson = None  # type: ignore[assignment]
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger("synapse_mcp.oauth")
 
 
+def _json_loads(data: bytes | str) -> Any:
+    """Parse JSON with orjson when installed; both raise json.JSONDecodeError."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
 @dataclass
 class ClientRegistration:
     """Serializable representation of a dynamically registered client."""
@@ -47,25 +69,68 @@ class ClientRegistry:
 
 
 class FileClientRegistry(ClientRegistry):
-    """File-backed registry for DCR clients."""
+    """File-backed registry for DCR clients.
+
+    The file is parsed once and then served from memory. ``_lock`` guards the
+    in-memory records only; file writes happen under ``_write_lock`` so reads
+    and other registrations are not held up by disk I/O. Each mutation bumps a
+    version, letting a writer drop a snapshot that a newer one has superseded.
+    """
 
     def __init__(self, path: Path) -> None:
         self._path = path
         self._lock = Lock()
+        self._write_lock = Lock()
+        self._records: Optional[dict[str, dict[str, Any]]] = None
+        self._version = 0
+        self._written_version = 0
+        self._last_written: Optional[bytes] = None
         self._path.parent.mkdir(parents=True, exist_ok=True)
 
+    def _load_unlocked(self) -> dict[str, dict[str, Any]]:
+        if self._records is None:
+            records: dict[str, dict[str, Any]] = {}
+            if self._path.exists():
+                try:
+                    records = _json_loads(self._path.read_bytes())
+                except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+                    logger.warning("Ignoring corrupt client registry file %s: %s", self._path, exc)
+            self._records = records
+        return self._records
+
+    def _snapshot_unlocked(self) -> tuple[int, dict[str, dict[str, Any]]]:
+        self._version += 1
+        # Records are replaced, never mutated in place, so a shallow copy suffices
+        return self._version, dict(self._records)
+
+    def _write(self, version: int, records: dict[str, dict[str, Any]]) -> None:
+        with self._write_lock:
+            if version <= self._written_version:
+                return
+            payload = _json_dumps(records, indent=True)
+            if payload != self._last_written:
+                # Write beside the target and swap it in so a crash never
+                # leaves a truncated registry behind
+                tmp_path = self._path.with_name(self._path.name + ".tmp")
+                try:
+                    tmp_path.write_bytes(payload)
+                    os.replace(tmp_path, self._path)
+                except OSError:
+                    tmp_path.unlink(missing_ok=True)
+                    self._last_written = None
+                    # The in-memory records hold changes that never reached disk
+                    with self._lock:
+                        self._records = None
+                    raise
+                self._last_written = payload
+            self._written_version = version
+
     def load_all(self) -> list[ClientRegistration]:
         with self._lock:
-            if not self._path.exists():
-                return []
-            try:
-                data = json.loads(self._path.read_text())
-            except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-                logger.warning("Failed to parse client registry file %s: %s", self._path, exc)
-                return []
+            items = list(self._load_unlocked().values())
 
         registrations: list[ClientRegistration] = []
-        for item in data.values():
+        for item in items:
             registrations.append(
                 ClientRegistration(
                     client_id=item["client_id"],
@@ -78,26 +143,16 @@ class FileClientRegistry(ClientRegistry):
 
     def save(self, registration: ClientRegistration) -> None:
         with self._lock:
-            records = {}
-            if self._path.exists():
-                try:
-                    records = json.loads(self._path.read_text())
-                except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-                    logger.warning("Resetting corrupt client registry file %s: %s", self._path, exc)
-            records[registration.client_id] = asdict(registration)
-            self._path.write_text(json.dumps(records, indent=2))
+            self._load_unlocked()[registration.client_id] = asdict(registration)
+            version, records = self._snapshot_unlocked()
+        self._write(version, records)
 
     def remove(self, client_id: str) -> None:
         with self._lock:
-            if not self._path.exists():
-                return
-            try:
-                records = json.loads(self._path.read_text())
-            except json.JSONDecodeError:  # pragma: no cover - defensive
+            if self._load_unlocked().pop(client_id, None) is None:
                 return
-            if client_id in records:
-                records.pop(client_id, None)
-                self._path.write_text(json.dumps(records, indent=2))
+            version, records = self._snapshot_unlocked()
+        self._write(version, records)
 
 
 class RedisClientRegistry(ClientRegistry):
@@ -119,7 +174,7 @@ class RedisClientRegistry(ClientRegistry):
         registrations: list[ClientRegistration] = []
         for raw in records.values():
             try:
-                item = json.loads(raw)
+                item = _json_loads(raw)
                 registrations.append(
                     ClientRegistration(
                         client_id=item["client_id"],
@@ -134,7 +189,7 @@ class RedisClientRegistry(ClientRegistry):
 
     def save(self, registration: ClientRegistration) -> None:
         try:
-            self._redis.hset(self._namespace, registration.client_id, json.dumps(asdict(registration)))
+            self._redis.hset(self._namespace, registration.client_id, _json_dumps(asdict(registration)))
         except RedisError as exc:  # pragma: no cover - network failures
             logger.warning("Failed to persist client %s to Redis: %s", registration.client_id, exc)
 
@@ -202,7 +257,7 @@ def load_static_registrations() -> list[ClientRegistration]:
         return []
 
     try:
-        payload = json.loads(data)
+        payload = _json_loads(data)
     except json.JSONDecodeError as exc:  # pragma: no cover - defensive
         logger.warning("Invalid JSON in static client configuration: %s", exc)
         return []
@@ -2,15 +2,42 @@
 
 import asyncio
 import logging
+import time
 from concurrent.futures import ThreadPoolExecutor
-from types import SimpleNamespace
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from jwt import PyJWKClient, decode
 from jwt.exceptions import PyJWTError
 
+from ..utils import ExpiringLRUCache, token_digest
+
 logger = logging.getLogger("synapse_mcp.oauth")
 
+# Verified tokens are reused for at most this long (or until they expire) so
+# repeat requests skip signature verification without hiding revocations for long.
+VERIFIED_TOKEN_TTL_SECONDS = 30
+_VERIFIED_TOKEN_CACHE_MAXSIZE = 10000
+
+# Signing keys resolved per JWT header segment (which carries kid and alg).
+# Tokens from the same key share a header, so most verifications skip the
+# JWKS client entirely; the TTL bounds how long a rotated-out key lingers.
+SIGNING_KEY_TTL_SECONDS = 3600
+_SIGNING_KEY_CACHE_MAXSIZE = 32
+
+
+@dataclass(slots=True)
+class FastMCPAccessToken:
+    """Verified Synapse token in the shape FastMCP's auth layer reads."""
+
+    sub: Optional[str]
+    client_id: Optional[Any]
+    expires_at: int
+    scopes: List[str]
+    claims: Dict[str, Any]
+    token: str
+    raw_token: str = ""
+
 
 class SynapseJWTVerifier:
     """JWT verifier that adapts Synapse tokens to FastMCP's expectations."""
@@ -27,10 +54,20 @@ class SynapseJWTVerifier:
         self.audience = audience
         self.algorithm = algorithm
         self.required_scopes = required_scopes or []
-        self.jwks_client = PyJWKClient(uri=jwks_uri)
+        # cache_keys keeps parsed signing keys per kid; without it PyJWT rebuilds
+        # every RSA key from the cached JWK set on each verification.
+        self.jwks_client = PyJWKClient(uri=jwks_uri, cache_keys=True)
         self._executor = ThreadPoolExecutor(max_workers=2)
+        self._verified_tokens = ExpiringLRUCache(maxsize=_VERIFIED_TOKEN_CACHE_MAXSIZE)
+        self._signing_keys = ExpiringLRUCache(maxsize=_SIGNING_KEY_CACHE_MAXSIZE)
 
-    async def verify_token(self, token: str) -> Optional[SimpleNamespace]:
+    async def verify_token(self, token: str) -> Optional[FastMCPAccessToken]:
+        # Opaque tokens (e.g. PATs) can never verify; skip the JWKS lookup and executor hop
+        if token.count(".") != 2:
+            return None
+        cached = self._verified_tokens.get(token_digest(token))
+        if cached is not None:
+            return cached
         try:
             loop = asyncio.get_event_loop()
             return await loop.run_in_executor(self._executor, self._verify_token_sync, token)
@@ -38,9 +75,9 @@ class SynapseJWTVerifier:
             logger.error("Error in async Synapse JWT verification: %s", exc)
             return None
 
-    def _verify_token_sync(self, token: str) -> Optional[SimpleNamespace]:
+    def _verify_token_sync(self, token: str) -> Optional[FastMCPAccessToken]:
         try:
-            signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+            signing_key = self._get_signing_key(token)
             decoded = decode(
                 jwt=token,
                 key=signing_key.key,
@@ -55,13 +92,29 @@ class SynapseJWTVerifier:
                 return None
 
             access_token_obj = self._create_fastmcp_access_token(decoded, scopes, token)
-            access_token_obj.raw_token = token
+
+            # Only successful verifications are cached, never past the token's exp
+            now = time.time()
+            expires_at = now + VERIFIED_TOKEN_TTL_SECONDS
+            exp = decoded.get("exp")
+            if exp is not None:
+                expires_at = min(expires_at, exp)
+            if expires_at > now:
+                self._verified_tokens.set(token_digest(token), access_token_obj, expires_at=expires_at)
             return access_token_obj
 
         except PyJWTError as exc:
             logger.error("JWT verification failed: %s", exc)
             return None
 
+    def _get_signing_key(self, token: str) -> Any:
+        header = token.partition(".")[0]
+        signing_key = self._signing_keys.get(header)
+        if signing_key is None:
+            signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+            self._signing_keys.set(header, signing_key, expires_at=time.time() + SIGNING_KEY_TTL_SECONDS)
+        return signing_key
+
     def _extract_synapse_scopes(self, decoded: Dict[str, Any]) -> List[str]:
         if "access" in decoded and "scope" in decoded["access"]:
             scopes = decoded["access"]["scope"]
@@ -87,14 +140,16 @@ class SynapseJWTVerifier:
 
     def _create_fastmcp_access_token(
         self, decoded: Dict[str, Any], scopes: List[str], token: str
-    ) -> SimpleNamespace:
-        access_token = SimpleNamespace()
-        access_token.sub = decoded.get("sub")
-        access_token.client_id = decoded.get("aud")
-        access_token.expires_at = decoded.get("exp", 0)
-        access_token.scopes = scopes
-        access_token.claims = decoded
-        access_token.token = token
+    ) -> FastMCPAccessToken:
+        access_token = FastMCPAccessToken(
+            sub=decoded.get("sub"),
+            client_id=decoded.get("aud"),
+            expires_at=decoded.get("exp", 0),
+            scopes=scopes,
+            claims=decoded,
+            token=token,
+            raw_token=token,
+        )
         logger.debug("Created FastMCP access token for subject: %s", access_token.sub)
         return access_token
 
@@ -103,4 +158,4 @@ class SynapseJWTVerifier:
             self._executor.shutdown(wait=False)
 
 
-__all__ = ["SynapseJWTVerifier"]
+__all__ = ["FastMCPAccessToken", "SynapseJWTVerifier"]
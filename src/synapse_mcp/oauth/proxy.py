@@ -1,15 +1,19 @@
 """FastMCP OAuth proxy extensions for Synapse."""
 
+import asyncio
 import logging
 import os
+import time
 from typing import Any, List, Optional
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
+import jwt
 from fastmcp.server.auth import OAuthProxy
 from fastmcp.server.auth.oauth_proxy import ProxyDCRClient
 from pydantic import AnyUrl, TypeAdapter
 
 from ..session_storage import create_session_storage
+from ..utils import ExpiringLRUCache
 from .client_registry import (
     ClientRegistration,
     create_client_registry,
@@ -18,6 +22,13 @@ from .client_registry import (
 
 logger = logging.getLogger("synapse_mcp.oauth")
 
+# Authorization codes that are never exchanged must not pin their session forever
+AUTHORIZATION_CODE_TTL_SECONDS = 600
+_CODE_SESSIONS_MAXSIZE = 10000
+
+_DEFAULT_GRANT_TYPES = ("authorization_code", "refresh_token")
+_REDIRECT_URIS_ADAPTER = TypeAdapter(List[AnyUrl])
+
 
 class SessionAwareOAuthProxy(OAuthProxy):
     """OAuth proxy that mirrors tokens into session storage."""
@@ -26,7 +37,7 @@ class SessionAwareOAuthProxy(OAuthProxy):
         super().__init__(*args, **kwargs)
         self._session_storage = create_session_storage()
         self._session_tokens: dict[str, tuple[str, Optional[str]]] = {}
-        self._code_sessions: dict[str, str] = {}
+        self._code_sessions = ExpiringLRUCache(maxsize=_CODE_SESSIONS_MAXSIZE)
         self._client_registry = create_client_registry(os.environ)
         if not hasattr(self, "_clients"):
             # Guard against older fastmcp versions where OAuthProxy skipped initialization.
@@ -51,20 +62,17 @@ class SessionAwareOAuthProxy(OAuthProxy):
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Failed to load static OAuth clients: %s", exc)
 
-        default_grants = ["authorization_code", "refresh_token"]
-
         for record in registrations:
             if record.client_id in self._clients:
                 continue
             try:
-                adapter = TypeAdapter(List[AnyUrl])
                 redirect_source = record.redirect_uris if record.redirect_uris else ["http://127.0.0.1"]
-                redirect_uris = adapter.validate_python(redirect_source)
+                redirect_uris = _REDIRECT_URIS_ADAPTER.validate_python(redirect_source)
                 proxy_client = ProxyDCRClient(
                     client_id=record.client_id,
                     client_secret=record.client_secret,
                     redirect_uris=redirect_uris,
-                    grant_types=record.grant_types or default_grants,
+                    grant_types=record.grant_types or list(_DEFAULT_GRANT_TYPES),
                     scope=self._default_scope_str,
                     token_endpoint_auth_method="none",
                     allowed_redirect_uri_patterns=self._allowed_client_redirect_uris,
@@ -82,9 +90,10 @@ class SessionAwareOAuthProxy(OAuthProxy):
                 client_id=client_info.client_id,
                 client_secret=_extract_secret(client_info.client_secret),
                 redirect_uris=[str(uri) for uri in (client_info.redirect_uris or [])],
-                grant_types=list(client_info.grant_types or ["authorization_code", "refresh_token"]),
+                grant_types=list(client_info.grant_types or _DEFAULT_GRANT_TYPES),
             )
-            self._client_registry.save(registration)
+            # File and Redis registries block; keep them off the event loop
+            await asyncio.to_thread(self._client_registry.save, registration)
             logger.debug("Persisted OAuth client %s", client_info.client_id)
         except Exception as exc:  # pragma: no cover - defensive
             logger.warning("Unable to persist OAuth client %s: %s", client_info.client_id, exc)
@@ -128,8 +137,9 @@ class SessionAwareOAuthProxy(OAuthProxy):
             if session_id:
                 client_codes = getattr(self, "_client_codes", {})
                 new_codes = [code for code in client_codes if code not in existing_codes]
+                expires_at = time.time() + AUTHORIZATION_CODE_TTL_SECONDS
                 for code in new_codes:
-                    self._code_sessions[code] = session_id
+                    self._code_sessions.set(code, session_id, expires_at=expires_at)
                     logger.debug("Cached authorization code %s for session %s", code[:8], session_id)
             try:
                 await self._map_new_tokens_to_users()
@@ -197,19 +207,18 @@ class SessionAwareOAuthProxy(OAuthProxy):
     async def _map_new_tokens_to_users(self) -> None:
         existing_users = await self._session_storage.get_all_user_subjects()
         access_tokens = getattr(self, "_access_tokens", {})
-        known_attrs = [attr for attr in dir(self) if "token" in attr.lower() and not attr.startswith("__")]
-        logger.debug(
-            "_map_new_tokens_to_users: existing_users=%s tokens=%s token_attrs=%s",
-            existing_users,
-            [t[:8] + "***" for t in access_tokens],
-            {attr: _summarize_token_attr(attr, getattr(self, attr, None)) for attr in known_attrs},
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            known_attrs = [attr for attr in dir(self) if "token" in attr.lower() and not attr.startswith("__")]
+            logger.debug(
+                "_map_new_tokens_to_users: existing_users=%s tokens=%s token_attrs=%s",
+                existing_users,
+                [t[:8] + "***" for t in access_tokens],
+                {attr: _summarize_token_attr(attr, getattr(self, attr, None)) for attr in known_attrs},
+            )
         unmapped_tokens = [token for token in access_tokens if await self._session_storage.find_user_by_token(token) is None]
 
         for token_key in unmapped_tokens:
             try:
-                import jwt
-
                 decoded = jwt.decode(token_key, options={"verify_signature": False})
                 user_subject = decoded.get("sub")
                 if user_subject:
@@ -229,8 +238,7 @@ class SessionAwareOAuthProxy(OAuthProxy):
     async def cleanup_user_tokens(self, user_subject: str) -> None:
         token_key = await self._session_storage.get_user_token(user_subject)
         if token_key:
-            if token_key in self._access_tokens:
-                del self._access_tokens[token_key]
+            self._access_tokens.pop(token_key, None)
             await self._session_storage.remove_user_token(user_subject)
             logger.info("Cleaned up token for user %s", user_subject)
             for session_id, (mapped_token, _) in list(self._session_tokens.items()):
@@ -261,14 +269,11 @@ class SessionAwareOAuthProxy(OAuthProxy):
 
     def _is_token_old_enough_to_cleanup(self, token: str, min_age_seconds: int = 30) -> bool:
         try:
-            import jwt
-            from datetime import datetime, timezone
-
             decoded = jwt.decode(token, options={"verify_signature": False})
             issued_at = decoded.get("iat")
             if not issued_at:
                 return True
-            token_age = datetime.now(timezone.utc).timestamp() - issued_at
+            token_age = time.time() - issued_at
             if token_age <= min_age_seconds:
                 logger.debug("Token is only %.1fs old, keeping for now", token_age)
                 return False
@@ -286,7 +291,8 @@ class SessionAwareOAuthProxy(OAuthProxy):
             token = await self._session_storage.get_user_token(subject)
             if token:
                 tokens.append((subject, token))
-        logger.debug("iter_user_tokens -> %s", [(sub, tok[:8] + "***") for sub, tok in tokens])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("iter_user_tokens -> %s", [(sub, tok[:8] + "***") for sub, tok in tokens])
         return tokens
 
     async def get_token_for_current_user(self) -> Optional[tuple[str, Optional[str]]]:
@@ -300,7 +306,8 @@ class SessionAwareOAuthProxy(OAuthProxy):
 
     def get_session_token_info(self, session_id: str) -> Optional[tuple[str, Optional[str]]]:
         info = self._session_tokens.get(session_id)
-        logger.debug("get_session_token_info(%s) -> %s", session_id, (info[0][:8] + "***", info[1]) if info else None)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("get_session_token_info(%s) -> %s", session_id, (info[0][:8] + "***", info[1]) if info else None)
         return info
 
     async def get_token_for_session(self, session_id: str) -> Optional[tuple[str, Optional[str]]]:
@@ -314,14 +321,18 @@ class SessionAwareOAuthProxy(OAuthProxy):
 
 def _extract_session_id(request) -> Optional[str]:
     try:
-        if hasattr(request, "headers"):
-            session_id = request.headers.get("mcp-session-id")
-            if session_id:
-                return session_id
-        if hasattr(request, "state"):
-            session_context = getattr(request.state, "session_context", None)
-            if session_context and hasattr(session_context, "session_id"):
-                return session_context.session_id
+        session_id = request.headers.get("mcp-session-id")
+        if session_id:
+            return session_id
+    except AttributeError:
+        pass
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.debug("Could not extract session ID from callback: %s", exc)
+
+    try:
+        return request.state.session_context.session_id
+    except AttributeError:
+        return None
     except Exception as exc:  # pragma: no cover - defensive
         logger.debug("Could not extract session ID from callback: %s", exc)
     return None
@@ -9,6 +9,10 @@ from .app import mcp
 
 BLOG_FEED_URL = "https://sagebionetworks.pubpub.org/rss.xml"
 
+# Reused across fetches so repeat reads ride a keep-alive connection instead of
+# paying a fresh TCP + TLS handshake each time.
+_http_session = requests.Session()
+
 
 @mcp.resource(
     "synapse://feeds/blog",
@@ -21,7 +25,7 @@ def synapse_blog_feed() -> str:
     """Fetch the latest Sage Bionetworks publication feed as raw XML."""
 
     try:
-        response = requests.get(BLOG_FEED_URL, timeout=10)
+        response = _http_session.get(BLOG_FEED_URL, timeout=10)
         response.raise_for_status()
         return response.text
     except requests.RequestException as exc:  # pragma: no cover - network failure fallback
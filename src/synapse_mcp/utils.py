@@ -1,5 +1,12 @@
+import base64
+from collections import OrderedDict
+import hashlib
+import json
+from threading import Lock
+import time
+from typing import Callable, Dict, Hashable, List, Any, Optional, Union
+
 import synapseclient
-from typing import Dict, List, Any, Optional, Union
 
 def format_synapse_entity(entity: Any) -> Dict[str, Any]:
     """Format a Synapse entity as a dictionary.
@@ -11,22 +18,22 @@ def format_synapse_entity(entity: Any) -> Dict[str, Any]:
         The entity as a dictionary
     """
     # Convert entity to a dictionary
-    if hasattr(entity, 'to_dict'):
-        entity_dict = entity.to_dict()
-    else:
-        # If entity doesn't have to_dict method, convert it manually
-        entity_dict = {
-            'id': entity.id if hasattr(entity, 'id') else None,
-            'name': entity.name if hasattr(entity, 'name') else None,
-            'type': entity.concreteType.split('.')[-1] if hasattr(entity, 'concreteType') else None,
-            'parentId': entity.parentId if hasattr(entity, 'parentId') else None,
-            'createdOn': entity.createdOn if hasattr(entity, 'createdOn') else None,
-            'modifiedOn': entity.modifiedOn if hasattr(entity, 'modifiedOn') else None,
-            'createdBy': entity.createdBy if hasattr(entity, 'createdBy') else None,
-            'modifiedBy': entity.modifiedBy if hasattr(entity, 'modifiedBy') else None,
-        }
-    
-    return entity_dict
+    to_dict = getattr(entity, 'to_dict', None)
+    if to_dict is not None:
+        return to_dict()
+
+    # If entity doesn't have to_dict method, convert it manually
+    concrete_type = getattr(entity, 'concreteType', None)
+    return {
+        'id': getattr(entity, 'id', None),
+        'name': getattr(entity, 'name', None),
+        'type': concrete_type.rsplit('.', 1)[-1] if concrete_type else None,
+        'parentId': getattr(entity, 'parentId', None),
+        'createdOn': getattr(entity, 'createdOn', None),
+        'modifiedOn': getattr(entity, 'modifiedOn', None),
+        'createdBy': getattr(entity, 'createdBy', None),
+        'modifiedBy': getattr(entity, 'modifiedBy', None),
+    }
 
 def format_annotations(annotations: Any) -> Dict[str, Any]:
     """Format Synapse annotations as a dictionary.
@@ -93,3 +100,101 @@ def mask_identifier(value: Optional[str], *, prefix: int = 6) -> Optional[str]:
     if len(value) <= prefix:
         return value[0] + "***"
     return value[:prefix] + "***"
+
+
+def decode_jwt_payload(token: str) -> Dict[str, Any]:
+    """Decode the claims of a JWT without verifying its signature.
+
+    Args:
+        token: A compact-serialized JWT (``header.payload.signature``)
+
+    Returns:
+        The decoded claims
+
+    Raises:
+        ValueError: If the token is not a well-formed JWT
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        raise ValueError("JWT must have exactly three segments")
+    payload = parts[1]
+    payload += "=" * (-len(payload) % 4)
+    claims = json.loads(base64.urlsafe_b64decode(payload))
+    if not isinstance(claims, dict):
+        raise ValueError("JWT payload must be a JSON object")
+    return claims
+
+
+def token_digest(token: str) -> bytes:
+    """Return a compact, non-reversible cache key for a bearer token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class ExpiringLRUCache:
+    """Bounded LRU mapping whose entries expire at a caller-supplied timestamp.
+
+    Used to memoise per-token work (validation, profile lookups) without
+    holding on to expired credentials or growing without bound. ``clock``
+    overrides ``time.time`` as the source of the current time.
+    """
+
+    def __init__(self, maxsize: int, clock: Optional[Callable[[], float]] = None) -> None:
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _now(self) -> float:
+        return time.time() if self._clock is None else self._clock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = self._now()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        now = self._now()
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or entry[0] <= now:
+            return default
+        return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return current size, capacity and lookup hit/miss counts."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
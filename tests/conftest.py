@@ -3,7 +3,21 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    """Reset module-level auth caches so tests cannot see each other's tokens."""
+    from synapse_mcp import auth_middleware, connection_auth
+
+    connection_auth._client_pool.clear()
+    auth_middleware._jwt_exp_cache.clear()
+    yield
+    connection_auth._client_pool.clear()
+    auth_middleware._jwt_exp_cache.clear()
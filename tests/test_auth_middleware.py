@@ -10,6 +10,7 @@ import pytest
 from synapse_mcp.auth_middleware import (
     AuthenticationError,
     OAuthTokenMiddleware,
+    PATAuthMiddleware,
     validate_jwt_token,
 )
 
@@ -262,3 +263,63 @@ async def test_middleware_works_for_resource_calls():
         result = await middleware.on_call_resource(context, call_next)
         assert result == "ok"
         assert fast_ctx.get_state("oauth_access_token") == token
+
+
+def test_validate_jwt_token_caches_decoded_expiration():
+    """Repeat validations of the same token should not decode it again."""
+    token = create_valid_jwt(expires_in_seconds=3600)
+    validate_jwt_token(token)
+
+    with patch("synapse_mcp.auth_middleware.decode_jwt_payload", side_effect=AssertionError("decoded twice")):
+        validate_jwt_token(token)
+
+
+def test_validate_jwt_token_rejects_cached_token_after_expiry():
+    """A cached token must still be rejected once its exp has passed."""
+    token = create_valid_jwt(expires_in_seconds=60)
+    validate_jwt_token(token)
+
+    with patch("time.time", return_value=datetime.now(timezone.utc).timestamp() + 120):
+        with pytest.raises(AuthenticationError) as exc_info:
+            validate_jwt_token(token)
+
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_pat_middleware_skips_write_when_token_already_present(monkeypatch):
+    """PAT injection should not rewrite context state that already holds the PAT."""
+    monkeypatch.setenv("SYNAPSE_PAT", "pat-token")
+    middleware = PATAuthMiddleware()
+    fast_ctx = DummyFastMCPContext()
+    context = SimpleNamespace(fastmcp_context=fast_ctx)
+
+    async def call_next(ctx):
+        return "ok"
+
+    await middleware.on_call_tool(context, call_next)
+    assert fast_ctx.get_state("synapse_pat_token") == "pat-token"
+
+    fast_ctx.set_state = MagicMock()
+    await middleware.on_call_resource(context, call_next)
+    fast_ctx.set_state.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_middleware_skips_state_write_when_token_unchanged():
+    """A context that already holds the validated token is not rewritten."""
+    token = create_valid_jwt()
+    fast_ctx = DummyFastMCPContext()
+    fast_ctx.set_state("oauth_access_token", token)
+    fast_ctx.set_state = MagicMock()
+    context = SimpleNamespace(fastmcp_context=fast_ctx)
+
+    async def call_next(ctx):
+        return "ok"
+
+    with patch("synapse_mcp.auth_middleware.get_http_request") as mock_get_request:
+        mock_get_request.return_value = DummyHTTPRequest(headers={"authorization": f"Bearer {token}"})
+        middleware = OAuthTokenMiddleware()
+        await middleware.on_call_resource(context, call_next)
+
+    fast_ctx.set_state.assert_not_called()
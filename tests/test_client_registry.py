@@ -2,6 +2,7 @@
 
 import json
 from dataclasses import asdict
+from pathlib import Path
 
 import pytest
 
@@ -92,3 +93,55 @@ def test_file_registry_resolves_path(tmp_path, monkeypatch):
     contents = json.loads(path.read_text())
     assert registration.client_id in contents
     assert contents[registration.client_id] == asdict(registration)
+
+
+def test_file_registry_round_trip(tmp_path):
+    path = tmp_path / "client_registry.json"
+    registry = FileClientRegistry(path)
+
+    registry.save(make_registration(1))
+    registry.save(make_registration(2))
+    registry.remove("client-1")
+
+    assert FileClientRegistry(path).load_all() == [make_registration(2)]
+
+
+def test_file_registry_parses_file_once(tmp_path, monkeypatch):
+    path = tmp_path / "client_registry.json"
+    FileClientRegistry(path).save(make_registration(1))
+
+    reads = []
+    original_read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or original_read_bytes(self))
+
+    registry = FileClientRegistry(path)
+    registry.load_all()
+    registry.save(make_registration(2))
+
+    assert len(registry.load_all()) == 2
+    assert len(reads) == 1
+
+
+def test_file_registry_skips_unchanged_writes(tmp_path, monkeypatch):
+    path = tmp_path / "client_registry.json"
+    registry = FileClientRegistry(path)
+    registry.save(make_registration(1))
+
+    replaced = []
+    monkeypatch.setattr("synapse_mcp.oauth.client_registry.os.replace", lambda *args: replaced.append(args))
+    registry.save(make_registration(1))
+
+    assert replaced == []
+    assert not (tmp_path / "client_registry.json.tmp").exists()
+
+
+def test_file_registry_drops_superseded_snapshots(tmp_path):
+    path = tmp_path / "client_registry.json"
+    registry = FileClientRegistry(path)
+    registry.save(make_registration(1))
+    registry.save(make_registration(2))
+
+    # A writer holding the older snapshot must not clobber the newer file
+    registry._write(1, {})
+
+    assert set(json.loads(path.read_text())) == {"client-1", "client-2"}
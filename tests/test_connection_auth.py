@@ -4,6 +4,10 @@ Tests that connection_auth correctly reads OAuth tokens from context
 that were set by the auth_middleware.
 """
 
+import base64
+import json
+import threading
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -41,8 +45,11 @@ def patched_synapse(monkeypatch):
 
         def login(self, authToken=None, **kwargs):
             self.logged_in = authToken
+            # synapseclient resolves the profile into credentials during login
+            self.credentials = SimpleNamespace(owner_id="user-123", username="tester")
 
         def getUserProfile(self):
+            self.profile_calls = getattr(self, "profile_calls", 0) + 1
             return {"ownerId": "user-123", "userName": "tester"}
 
     monkeypatch.setattr(connection_auth.synapseclient, "Synapse", DummySynapse)
@@ -58,3 +65,174 @@ def test_oauth_authentication_uses_token_from_context(patched_synapse):
     assert patched_synapse[0].logged_in == "token-abc"
     assert connection_auth._get_state(ctx, connection_auth.SYNAPSE_CLIENT_KEY) is client
     assert connection_auth._get_state(ctx, "oauth_access_token") == "token-abc"
+
+
+def _jwt_with_claims(**claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJub25lIn0.{payload}.sig"
+
+
+def test_pat_identity_comes_from_login_without_profile_request(patched_synapse):
+    ctx = DummyContext()
+    ctx.set_state("synapse_pat_token", "pat-token")
+
+    connection_auth.get_synapse_client(ctx)
+
+    assert not hasattr(patched_synapse[0], "profile_calls")
+    auth_info = connection_auth.get_user_auth_info(ctx)
+    assert auth_info["user_id"] == "user-123"
+    assert auth_info["username"] == "tester"
+
+
+def test_connections_with_same_token_share_pooled_client(patched_synapse):
+    """A second connection with the same token reuses the authenticated client."""
+    ctx1 = DummyContext(oauth_token="token-abc")
+    ctx2 = DummyContext(oauth_token="token-abc")
+
+    client1 = connection_auth.get_synapse_client(ctx1)
+    client2 = connection_auth.get_synapse_client(ctx2)
+
+    assert client1 is client2
+    assert len(patched_synapse) == 1
+    assert connection_auth.get_user_auth_info(ctx2)["username"] == "tester"
+    assert connection_auth.is_authenticated(ctx2)
+
+
+def test_connections_with_different_tokens_get_separate_clients(patched_synapse):
+    client1 = connection_auth.get_synapse_client(DummyContext(oauth_token="token-abc"))
+    client2 = connection_auth.get_synapse_client(DummyContext(oauth_token="token-def"))
+
+    assert client1 is not client2
+
+
+def test_cache_stats_report_pool_usage(patched_synapse):
+    connection_auth.get_synapse_client(DummyContext(oauth_token="token-abc"))
+    connection_auth.get_synapse_client(DummyContext(oauth_token="token-abc"))
+
+    stats = connection_auth.get_cache_stats()["client_pool"]
+    assert stats["size"] == 1
+    assert stats["maxsize"] == connection_auth.CLIENT_POOL_MAXSIZE
+    assert stats["hits"] == 1
+
+
+def test_pool_hits_do_not_decode_token_again(patched_synapse, monkeypatch):
+    """The token expiry is kept in the pool entry, so reuse skips JWT decoding."""
+    token = _jwt_with_claims(sub="3350001", exp=time.time() + 3600)
+    connection_auth.get_synapse_client(DummyContext(oauth_token=token))
+
+    def fail_decode(token):
+        raise AssertionError("token decoded on a pool hit")
+
+    monkeypatch.setattr(connection_auth, "decode_jwt_payload", fail_decode)
+    connection_auth.get_synapse_client(DummyContext(oauth_token=token))
+
+    assert len(patched_synapse) == 1
+
+
+def test_oauth_identity_comes_from_login_and_scopes_from_claims(patched_synapse):
+    """The pairwise ``sub`` claim is not the owner id; only scopes come from the token."""
+    token = _jwt_with_claims(sub="ppid-abc", exp=time.time() + 3600, access={"scope": ["view", "download"]})
+    ctx = DummyContext(oauth_token=token)
+
+    connection_auth.get_synapse_client(ctx)
+
+    assert not hasattr(patched_synapse[0], "profile_calls")
+    auth_info = connection_auth.get_user_auth_info(ctx)
+    assert auth_info["user_id"] == "user-123"
+    assert auth_info["username"] == "tester"
+    assert connection_auth.has_scope(ctx, "download")
+    assert not connection_auth.has_scope(ctx, "modify")
+
+
+def test_profile_verification_keeps_token_scopes(patched_synapse, monkeypatch):
+    """The verification flag adds a profile check without dropping claim scopes."""
+    monkeypatch.setattr(connection_auth, "VERIFY_PROFILE_ON_AUTH", True)
+    token = _jwt_with_claims(sub="ppid-abc", exp=time.time() + 3600, access={"scope": ["view", "download"]})
+    ctx = DummyContext(oauth_token=token)
+
+    connection_auth.get_synapse_client(ctx)
+
+    assert patched_synapse[0].profile_calls == 1
+    assert connection_auth.get_user_auth_info(ctx)["user_id"] == "user-123"
+    assert connection_auth.has_scope(ctx, "download")
+    assert not connection_auth.has_scope(ctx, "modify")
+
+
+def test_profile_verification_rejects_mismatched_profile(patched_synapse, monkeypatch):
+    monkeypatch.setattr(connection_auth, "VERIFY_PROFILE_ON_AUTH", True)
+    monkeypatch.setattr(
+        connection_auth.synapseclient.Synapse,
+        "getUserProfile",
+        lambda self: {"ownerId": "someone-else", "userName": "other"},
+    )
+    ctx = DummyContext(oauth_token=_jwt_with_claims(sub="ppid-abc", exp=time.time() + 3600))
+
+    with pytest.raises(connection_auth.ConnectionAuthError):
+        connection_auth.get_synapse_client(ctx)
+
+    assert connection_auth.get_cache_stats()["client_pool"]["size"] == 0
+
+
+def test_concurrent_cold_connections_share_one_login(monkeypatch):
+    """Parallel first requests for one token should log in only once."""
+    created = []
+
+    class SlowSynapse:
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+
+        def login(self, authToken=None, **kwargs):
+            time.sleep(0.05)
+
+        def getUserProfile(self):
+            return {"ownerId": "user-123", "userName": "tester"}
+
+    monkeypatch.setattr(connection_auth.synapseclient, "Synapse", SlowSynapse)
+
+    results = []
+
+    def connect():
+        results.append(connection_auth.get_synapse_client(DummyContext(oauth_token="token-abc")))
+
+    threads = [threading.Thread(target=connect) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in results)
+    assert connection_auth._auth_locks == {}
+
+
+def test_failed_logins_stay_serialized_while_callers_wait(monkeypatch):
+    """The login lock survives until its last waiter, even when no client gets pooled."""
+    active = []
+    overlaps = []
+
+    class FailingSynapse:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def login(self, authToken=None, **kwargs):
+            active.append(self)
+            overlaps.append(len(active))
+            time.sleep(0.02)
+            active.remove(self)
+            raise RuntimeError("login rejected")
+
+    monkeypatch.setattr(connection_auth.synapseclient, "Synapse", FailingSynapse)
+
+    def connect():
+        with pytest.raises(connection_auth.ConnectionAuthError):
+            connection_auth.get_synapse_client(DummyContext(oauth_token="token-abc"))
+
+    threads = [threading.Thread(target=connect) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(overlaps) == 6
+    assert max(overlaps) == 1
+    assert connection_auth._auth_locks == {}
@@ -1,5 +1,8 @@
 """Connection-scoped authentication regression tests."""
 
+from types import SimpleNamespace
+import weakref
+
 import pytest
 
 import synapse_mcp
@@ -24,7 +27,8 @@ def _make_client(user_id: str):
             self._user = user
 
         def login(self, **kwargs):
-            return None
+            # synapseclient resolves the profile into credentials during login
+            self.credentials = SimpleNamespace(owner_id=self._user, username=f"{self._user}@example.com")
 
         def getUserProfile(self):
             return {
@@ -40,23 +44,30 @@ def clear_env(monkeypatch):
     monkeypatch.delenv("SYNAPSE_PAT", raising=False)
 
 
-def test_get_synapse_client_creates_connection_scoped_clients(monkeypatch):
+def test_get_synapse_client_pools_clients_by_token(monkeypatch):
     ctx1 = DummyContext()
     ctx2 = DummyContext()
+    ctx3 = DummyContext()
 
     # Simulate middleware injecting PAT token into context
-    ctx1.set_state("synapse_pat_token", "fake-pat")
-    ctx2.set_state("synapse_pat_token", "fake-pat")
+    ctx1.set_state("synapse_pat_token", "fake-pat-1")
+    ctx2.set_state("synapse_pat_token", "fake-pat-2")
+    ctx3.set_state("synapse_pat_token", "fake-pat-1")
 
     clients = [_make_client("user1"), _make_client("user2")]
     monkeypatch.setattr(connection_auth.synapseclient, "Synapse", lambda *args, **kwargs: clients.pop(0))
 
     client1 = connection_auth.get_synapse_client(ctx1)
     client2 = connection_auth.get_synapse_client(ctx2)
+    client3 = connection_auth.get_synapse_client(ctx3)
 
+    # Different tokens get different clients; the same token reuses its pooled client
     assert client1 is not client2
+    assert client3 is client1
+    assert clients == []
     assert get_user_auth_info(ctx1)["user_id"] == "user1"
     assert get_user_auth_info(ctx2)["user_id"] == "user2"
+    assert get_user_auth_info(ctx3)["user_id"] == "user1"
 
 
 def test_get_synapse_client_uses_cached_client(monkeypatch):
@@ -108,3 +119,36 @@ def test_get_entity_operations_are_per_connection(monkeypatch):
     assert ops2["base"].synapse_client is client2
 
 
+def test_get_entity_operations_shared_for_same_client(monkeypatch):
+    ctx1 = DummyContext()
+    ctx2 = DummyContext()
+    ctx1.set_state("synapse_pat_token", "fake-pat")
+    ctx2.set_state("synapse_pat_token", "fake-pat")
+    client = _make_client("shared")
+    monkeypatch.setattr(connection_auth.synapseclient, "Synapse", lambda *args, **kwargs: client)
+
+    ops1 = synapse_mcp.get_entity_operations(ctx1)
+    ops2 = synapse_mcp.get_entity_operations(ctx2)
+
+    # Both connections use the pooled client, whose entry holds the one bundle
+    assert ops1 is ops2
+    assert ops1["base"].synapse_client is client
+    assert connection_auth.get_pooled_client(ctx1).entity_ops is ops1
+    assert not hasattr(client, "_synapse_mcp_entity_ops")
+
+
+def test_get_entity_operations_do_not_keep_client_alive(monkeypatch):
+    ctx = DummyContext()
+    ctx.set_state("synapse_pat_token", "fake-pat")
+    client = _make_client("collectable")
+    monkeypatch.setattr(connection_auth.synapseclient, "Synapse", lambda *args, **kwargs: client)
+
+    synapse_mcp.get_entity_operations(ctx)
+    monkeypatch.undo()
+    connection_auth._client_pool.clear()
+
+    client_ref = weakref.ref(client)
+    del client, ctx
+
+    # No reference cycle: the client is freed without waiting for the collector
+    assert client_ref() is None
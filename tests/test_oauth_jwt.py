@@ -1,7 +1,7 @@
 """Tests for Synapse JWT verifier."""
 
 import asyncio
-from types import SimpleNamespace
+import time
 
 import pytest
 
@@ -36,9 +36,11 @@ def test_verify_token_success(monkeypatch):
         required_scopes=["openid", "view"],
     )
 
-    result: SimpleNamespace = verifier._verify_token_sync("token")  # type: ignore[attr-defined]
+    result = verifier._verify_token_sync("token")  # type: ignore[attr-defined]
+    assert isinstance(result, jwt_module.FastMCPAccessToken)
     assert result.sub == "user"
     assert result.scopes == ["openid", "view"]
+    assert result.raw_token == "token"
 
 
 def test_verify_token_missing_scope_returns_none(monkeypatch):
@@ -80,3 +82,86 @@ def test_verify_token_handles_decode_error(monkeypatch):
 
     result = verifier._verify_token_sync("token")  # type: ignore[attr-defined]
     assert result is None
+
+
+def test_verify_token_reuses_cached_verification(monkeypatch):
+    decoded = {
+        "sub": "user",
+        "aud": "client",
+        "exp": time.time() + 3600,
+        "access": {"scope": ["openid", "view"]},
+    }
+    _setup_jwt_mocks(monkeypatch, decoded)
+
+    verifier = jwt_module.SynapseJWTVerifier(
+        jwks_uri="http://example/jwks",
+        issuer="issuer",
+        audience="client",
+    )
+
+    first = verifier._verify_token_sync("header.payload.sig")  # type: ignore[attr-defined]
+
+    def fail_decode(**kwargs):
+        raise AssertionError("token verified twice")
+
+    monkeypatch.setattr(jwt_module, "decode", fail_decode)
+    second = asyncio.run(verifier.verify_token("header.payload.sig"))
+    assert second is first
+
+
+def test_signing_key_is_reused_for_tokens_with_same_header(monkeypatch):
+    _setup_jwt_mocks(monkeypatch, {"sub": "user", "aud": "client", "exp": 123})
+    lookups = []
+    original_lookup = jwt_module.PyJWKClient.get_signing_key_from_jwt
+
+    def counting_lookup(self, token):
+        lookups.append(token)
+        return original_lookup(self, token)
+
+    monkeypatch.setattr(jwt_module.PyJWKClient, "get_signing_key_from_jwt", counting_lookup)
+
+    verifier = jwt_module.SynapseJWTVerifier(
+        jwks_uri="http://example/jwks",
+        issuer="issuer",
+        audience="client",
+    )
+
+    verifier._verify_token_sync("header.payload-1.sig")  # type: ignore[attr-defined]
+    verifier._verify_token_sync("header.payload-2.sig")  # type: ignore[attr-defined]
+    verifier._verify_token_sync("other-header.payload-3.sig")  # type: ignore[attr-defined]
+
+    assert lookups == ["header.payload-1.sig", "other-header.payload-3.sig"]
+
+
+def test_verify_token_does_not_cache_expired_claims(monkeypatch):
+    decoded = {
+        "sub": "user",
+        "aud": "client",
+        "exp": 123,
+        "access": {"scope": ["openid", "view"]},
+    }
+    _setup_jwt_mocks(monkeypatch, decoded)
+
+    verifier = jwt_module.SynapseJWTVerifier(
+        jwks_uri="http://example/jwks",
+        issuer="issuer",
+        audience="client",
+    )
+
+    verifier._verify_token_sync("token")  # type: ignore[attr-defined]
+    assert len(verifier._verified_tokens) == 0
+
+
+def test_verify_token_rejects_non_jwt_without_lookup(monkeypatch):
+    def fail_lookup(self, token):
+        raise AssertionError("JWKS lookup for opaque token")
+
+    monkeypatch.setattr(jwt_module.PyJWKClient, "get_signing_key_from_jwt", fail_lookup)
+
+    verifier = jwt_module.SynapseJWTVerifier(
+        jwks_uri="http://example/jwks",
+        issuer="issuer",
+        audience="client",
+    )
+
+    assert asyncio.run(verifier.verify_token("opaque-personal-access-token")) is None
@@ -1,15 +1,17 @@
 """Tests for the session-aware OAuth proxy."""
 
 import json
+import time
 from types import SimpleNamespace
-import sys
 
 import pytest
 from fastmcp.server.auth.oauth_proxy import OAuthClientInformationFull, OAuthProxy
 from starlette.responses import RedirectResponse
 
 import synapse_mcp.connection_auth as connection_auth
+import synapse_mcp.oauth.proxy as proxy_module
 from synapse_mcp.oauth.proxy import SessionAwareOAuthProxy
+from synapse_mcp.utils import ExpiringLRUCache
 
 
 pytestmark = pytest.mark.anyio("asyncio")
@@ -88,7 +90,7 @@ async def test_map_new_tokens_populates_storage(monkeypatch):
     proxy._access_tokens = {"token123": object()}
 
     dummy_jwt = SimpleNamespace(decode=lambda token, options=None: {"sub": "user-1"})
-    monkeypatch.setitem(sys.modules, "jwt", dummy_jwt)
+    monkeypatch.setattr(proxy_module, "jwt", dummy_jwt)
 
     await proxy._map_new_tokens_to_users()
 
@@ -150,19 +152,19 @@ async def test_handle_callback_tracks_new_codes(monkeypatch):
     result = await proxy._handle_idp_callback(request)
 
     assert result == "ok"
-    assert proxy._code_sessions["fresh-code"] == "session-123"
+    assert proxy._code_sessions.get("fresh-code") == "session-123"
     # Existing codes should not be remapped to the new session
-    assert "existing" not in proxy._code_sessions
+    assert proxy._code_sessions.get("existing") is None
 
 
 @pytest.mark.anyio
 async def test_exchange_binds_session_and_storage(monkeypatch):
     storage = FakeStorage()
     proxy = build_proxy(monkeypatch, storage, FakeRegistry())
-    proxy._code_sessions["code-1"] = "session-xyz"
+    proxy._code_sessions.set("code-1", "session-xyz", expires_at=time.time() + 60)
 
     dummy_jwt = SimpleNamespace(decode=lambda token, options=None: {"sub": "user-1"})
-    monkeypatch.setitem(sys.modules, "jwt", dummy_jwt)
+    monkeypatch.setattr(proxy_module, "jwt", dummy_jwt)
 
     async def fake_exchange(self, client, authorization_code):
         self._access_tokens["tokenXYZ"] = SimpleNamespace(
@@ -178,17 +180,48 @@ async def test_exchange_binds_session_and_storage(monkeypatch):
     result = await proxy.exchange_authorization_code(client, authorization_code)
 
     assert result.access_token == "tokenXYZ"
-    assert proxy._code_sessions == {}
+    assert len(proxy._code_sessions) == 0
     assert proxy._session_tokens["session-xyz"] == ("tokenXYZ", "user-1")
     assert storage.tokens["user-1"] == "tokenXYZ"
 
 
+@pytest.mark.anyio
+async def test_exchange_ignores_expired_authorization_code(monkeypatch):
+    storage = FakeStorage()
+    proxy = build_proxy(monkeypatch, storage, FakeRegistry())
+    now = [1000.0]
+    proxy._code_sessions = ExpiringLRUCache(maxsize=16, clock=lambda: now[0])
+    proxy._code_sessions.set(
+        "code-old", "session-old", expires_at=now[0] + proxy_module.AUTHORIZATION_CODE_TTL_SECONDS
+    )
+    now[0] += proxy_module.AUTHORIZATION_CODE_TTL_SECONDS + 1
+
+    dummy_jwt = SimpleNamespace(decode=lambda token, options=None: {"sub": "user-1"})
+    monkeypatch.setattr(proxy_module, "jwt", dummy_jwt)
+
+    async def fake_exchange(self, client, authorization_code):
+        self._access_tokens["tokenOLD"] = SimpleNamespace(
+            client_id=client.client_id, scopes=list(authorization_code.scopes), expires_at=0
+        )
+        return SimpleNamespace(access_token="tokenOLD")
+
+    monkeypatch.setattr(OAuthProxy, "exchange_authorization_code", fake_exchange)
+
+    client = SimpleNamespace(client_id="client-1")
+    authorization_code = SimpleNamespace(code="code-old", scopes=["view"])
+
+    await proxy.exchange_authorization_code(client, authorization_code)
+
+    assert "session-old" not in proxy._session_tokens
+    assert len(proxy._code_sessions) == 0
+
+
 @pytest.mark.anyio
 async def test_exchange_fallback_uses_existing_token(monkeypatch):
     storage = FakeStorage()
     storage.tokens["user-99"] = "tokenABC"
     proxy = build_proxy(monkeypatch, storage, FakeRegistry())
-    proxy._code_sessions["code-2"] = "session-abc"
+    proxy._code_sessions.set("code-2", "session-abc", expires_at=time.time() + 60)
     proxy._access_tokens["tokenABC"] = SimpleNamespace(client_id="client-77", scopes=["download"], expires_at=0)
 
     async def fake_exchange(self, client, authorization_code):
@@ -203,7 +236,7 @@ async def test_exchange_fallback_uses_existing_token(monkeypatch):
     result = await proxy.exchange_authorization_code(client, authorization_code)
 
     assert result.access_token == "tokenABC"
-    assert proxy._code_sessions == {}
+    assert len(proxy._code_sessions) == 0
     assert proxy._session_tokens["session-abc"] == ("tokenABC", "user-99")
 
 